@@ -25,26 +25,65 @@ play a simple looping empty-frame animation (useful for testing).
 """
 
 import os
+import sys
+import json
+import mmap
 import time
-import glob
+import queue
 import argparse
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import pygame
 
+# Optional: with numpy installed, greyscale videos are stored as 8-bit frames
+try:
+	import numpy as np
+except ImportError:
+	np = None
+# Optional: numba for --numba-brush, imported only when asked for (it is slow
+# to import); see load_numba_brush()
+
 
 ASSET_FRAMES_DIR = os.path.join("assets", "frames")
 ASSET_AUDIO_PATH = os.path.join("assets", "audio.mp3")
 OUTPUT_DIR = os.path.join("assets", "output")
 DEFAULT_FPS = 30
+FRAME_EXTS = {".png", ".jpg", ".jpeg", ".bmp"}
+AUDIO_EXTS = {".mp3", ".ogg", ".wav"}
+# Videos with at most this many frames are decoded up front; longer ones are
+# streamed through a bounded decode-ahead queue
+DEFAULT_CACHE_FRAMES = 512
+STREAM_QUEUE_FRAMES = 60
+# How long a lookup waits on the decoder before loading the frame itself
+STREAM_WAIT_SECONDS = 1.0
+# Greyscale detection: frames sampled at startup, and the largest R/G/B
+# spread per pixel still treated as grey (JPEG noise)
+GREY_SAMPLE_FRAMES = 8
+GREY_TOLERANCE = 8
+GREY_PALETTE = [(i, i, i) for i in range(256)]
+# Raw pixel pack written by --pack and preferred over image files at playback
+PACK_DATA = "frames.bin"
+PACK_INDEX = "frames.idx"
+# Brush sprites (and numba masks) kept per cache
+BRUSH_CACHE_SIZE = 16
+# Smallest brush radius handed to the numba kernel under --numba-brush
+NUMBA_BRUSH_MIN_RADIUS = 24
+
+
+def scan_dir(directory, exts):
+	# Sorted paths of the non-hidden files in directory with one of exts
+	if not os.path.isdir(directory):
+		return []
+	with os.scandir(directory) as it:
+		return sorted(
+			e.path for e in it
+			if not e.name.startswith(".") and e.is_file() and os.path.splitext(e.name)[1].lower() in exts
+		)
 
 
 def find_frame_files(frames_dir):
-	if not os.path.isdir(frames_dir):
-		return []
-	exts = ["*.png", "*.jpg", "*.jpeg", "*.bmp"]
-	files = []
-	for e in exts:
-		files.extend(glob.glob(os.path.join(frames_dir, e)))
-	return sorted(files)
+	return scan_dir(frames_dir, FRAME_EXTS)
 
 
 def load_frame_surface(path):
@@ -58,6 +97,272 @@ def load_frame_surface(path):
 		return None
 
 
+def scale_frame(surf, size, smooth=False):
+	# Fit a decoded frame to the canvas (nearest-neighbour unless smooth)
+	if surf is None:
+		# Use an empty surface if the load failed
+		return pygame.Surface(size)
+	# Frames usually already match the canvas
+	if surf.get_size() != size:
+		scale = pygame.transform.smoothscale if smooth else pygame.transform.scale
+		surf = scale(surf, size)
+	return surf
+
+
+def is_greyscale(surf):
+	# True if every pixel is a shade of grey (needs numpy)
+	rgb = np.frombuffer(pygame.image.tobytes(surf, "RGB"), np.uint8).reshape(-1, 3)
+	r, g, b = rgb[:, 0], rgb[:, 1], rgb[:, 2]
+	return int((np.maximum(np.maximum(r, g), b) - np.minimum(np.minimum(r, g), b)).max()) <= GREY_TOLERANCE
+
+
+def frames_look_greyscale(frame_files):
+	# Sample frames across the video; each frame is still checked before quantizing
+	step = max(1, len(frame_files) // GREY_SAMPLE_FRAMES)
+	for path in frame_files[::step][:GREY_SAMPLE_FRAMES]:
+		surf = load_frame_surface(path)
+		if surf is None or not is_greyscale(surf):
+			return False
+	return bool(frame_files)
+
+
+def to_grey8(surf):
+	# Copy a greyscale frame into an 8-bit grey-palette surface
+	grey = pygame.Surface(surf.get_size(), depth=8)
+	grey.set_palette(GREY_PALETTE)
+	pygame.surfarray.blit_array(grey, pygame.surfarray.array_green(surf))
+	return grey
+
+
+def prepare_frame(surf, size, use_alpha, smooth=False, grey=False):
+	# Scale a decoded frame and convert it to the display format (or 8-bit grey)
+	surf = scale_frame(surf, size, smooth)
+	if grey and is_greyscale(surf):
+		return to_grey8(surf)
+	return surf.convert_alpha() if use_alpha else surf.convert()
+
+
+def decode_frames(frame_files):
+	# Yield decoded frames in order, loaded on a thread pool a chunk at a time
+	chunk = 4 * (os.cpu_count() or 1)
+	with ThreadPoolExecutor(max_workers=os.cpu_count()) as ex:
+		for start in range(0, len(frame_files), chunk):
+			yield from ex.map(load_frame_surface, frame_files[start:start + chunk])
+
+
+def build_frame_cache(frame_files, size, use_alpha, smooth=False, grey=False):
+	# Decode, scale and convert every frame up front
+	return [prepare_frame(surf, size, use_alpha, smooth, grey) for surf in decode_frames(frame_files)]
+
+
+def frames_signature(frame_files):
+	# [count, newest mtime] of a pack's source images, to tell if it is stale
+	return [len(frame_files), max((os.path.getmtime(p) for p in frame_files), default=0)]
+
+
+def pack_frames(frames_dir, smooth=False):
+	# Write every frame as raw pixels to frames.bin + frames.idx; return the count
+	frame_files = find_frame_files(frames_dir)
+	if not frame_files:
+		return 0
+	first = load_frame_surface(frame_files[0])
+	if first is None:
+		return 0
+	size = first.get_size()
+	fmt = "RGBA" if first.get_alpha() is not None else "RGB"
+	source = frames_signature(frame_files)
+	index = []
+	offset = 0
+	with open(os.path.join(frames_dir, PACK_DATA), "wb") as out:
+		for surf in decode_frames(frame_files):
+			data = pygame.image.tobytes(scale_frame(surf, size, smooth), fmt)
+			out.write(data)
+			index.append((offset, len(data)))
+			offset += len(data)
+	with open(os.path.join(frames_dir, PACK_INDEX), "w") as f:
+		json.dump({"size": size, "format": fmt, "source": source, "frames": index}, f)
+	return len(index)
+
+
+def load_packed_frames(frames_dir):
+	# Map a pack written by pack_frames(); return (surfaces, size, format) or None
+	index_path = os.path.join(frames_dir, PACK_INDEX)
+	data_path = os.path.join(frames_dir, PACK_DATA)
+	if not (os.path.isfile(index_path) and os.path.isfile(data_path)):
+		return None
+	try:
+		with open(index_path) as f:
+			index = json.load(f)
+		frame_files = find_frame_files(frames_dir)
+		if frame_files and index["source"] != frames_signature(frame_files):
+			print(f"Packed frames in {frames_dir} do not match the images; ignoring them (re-run --pack)")
+			return None
+		size = tuple(index["size"])
+		fmt = index["format"]
+		with open(data_path, "rb") as f:
+			mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+		view = memoryview(mm)
+		if not index["frames"]:
+			raise ValueError(f"{PACK_INDEX} lists no frames")
+		frames = []
+		for off, n in index["frames"]:
+			if off < 0 or off + n > len(mm):
+				raise ValueError(f"frame at offset {off} runs past the end of {PACK_DATA}")
+			frames.append(pygame.image.frombuffer(view[off:off + n], size, fmt))
+	except (OSError, ValueError, KeyError, TypeError, pygame.error) as e:
+		print(f"Failed to open packed frames in {frames_dir}: {e}")
+		return None
+	return frames, size, fmt
+
+
+# Memory-bounded stand-in for build_frame_cache(): a decoder thread fills a
+# queue ahead of the playhead, and the main thread converts what it takes
+class FrameStream:
+	def __init__(self, frame_files, size, use_alpha, smooth=False, grey=False, depth=STREAM_QUEUE_FRAMES):
+		self.frame_files = frame_files
+		self.size = size
+		self.use_alpha = use_alpha
+		self.smooth = smooth
+		self.grey = grey
+		self._queue = queue.Queue(maxsize=max(1, depth))
+		self._lock = threading.Lock()
+		# bumped on every restart to tell stale queue entries apart
+		self._generation = 0
+		self._start = 0
+		# next frame the consumer expects from the queue
+		self._next = 0
+		self._current = (None, None)
+		threading.Thread(target=self._decode_loop, daemon=True).start()
+
+	def __len__(self):
+		return len(self.frame_files)
+
+	def __getitem__(self, idx):
+		if self._current[0] == idx:
+			return self._current[1]
+		surf = None
+		if (idx - self._next) % len(self.frame_files) < self._queue.maxsize:
+			# Queued or being decoded: wait for it; anything else is a seek
+			while surf is None:
+				try:
+					gen, i, frame = self._queue.get(timeout=STREAM_WAIT_SECONDS)
+				except queue.Empty:
+					break
+				if gen != self._generation:
+					continue
+				self._next = (i + 1) % len(self.frame_files)
+				if i == idx:
+					surf, quantized = frame
+		if surf is None:
+			surf, quantized = self._decode(idx)
+			self._restart((idx + 1) % len(self.frame_files))
+		if not quantized:
+			surf = surf.convert_alpha() if self.use_alpha else surf.convert()
+		self._current = (idx, surf)
+		return surf
+
+	def _decode(self, idx):
+		# (surface, whether it was quantized to 8-bit grey)
+		surf = scale_frame(load_frame_surface(self.frame_files[idx]), self.size, self.smooth)
+		if self.grey and is_greyscale(surf):
+			return to_grey8(surf), True
+		return surf, False
+
+	def _restart(self, start):
+		with self._lock:
+			self._generation += 1
+			self._start = start
+		self._next = start
+		# Free up space in case the decoder is blocked on a full queue
+		while True:
+			try:
+				self._queue.get_nowait()
+			except queue.Empty:
+				break
+
+	def _decode_loop(self):
+		while True:
+			with self._lock:
+				gen, i = self._generation, self._start
+			while gen == self._generation:
+				self._queue.put((gen, i, self._decode(i)))
+				i = (i + 1) % len(self.frame_files)
+
+
+@functools.lru_cache(maxsize=BRUSH_CACHE_SIZE)
+def get_brush(radius, color, background=(0, 0, 0, 0)):
+	# (2r x 2r) RGBA sprite of a filled circle on background
+	s = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+	s.fill(background)
+	pygame.draw.circle(s, color, (radius, radius), radius)
+	return s
+
+
+def stroke_points(start, end, radius):
+	# Brush centres half a radius apart from start (exclusive) to end
+	x1, y1 = end
+	if start is None:
+		return [end]
+	x0, y0 = start
+	steps = max(abs(x1 - x0), abs(y1 - y0)) // max(1, radius // 2)
+	if steps == 0:
+		return [end]
+	return [(x0 + (x1 - x0) * i // steps, y0 + (y1 - y0) * i // steps) for i in range(1, steps + 1)]
+
+
+def stamp_stroke(surf, sprite, start, end, radius, special_flags):
+	# Stamp sprite along start -> end and return the dirty rect
+	points = stroke_points(start, end, radius)
+	rects = surf.blits([(sprite, (x - radius, y - radius), None, special_flags) for x, y in points])
+	return rects[0].unionall(rects[1:])
+
+
+def load_numba_brush():
+	# Import numba and build the --numba-brush painter; None if unavailable
+	if np is None:
+		return None
+	try:
+		from numba import njit, prange
+	except ImportError:
+		return None
+
+	@njit(parallel=True, cache=True)
+	def _stamp_kernel(pixels, points, mask, color):
+		# Per-byte max of color into every masked pixel, like BLEND_RGBA_MAX
+		d = mask.shape[0]
+		height, width = pixels.shape[0], pixels.shape[1]
+		for j in prange(d):
+			for k in range(points.shape[0]):
+				y = points[k, 1] - d // 2 + j
+				if y < 0 or y >= height:
+					continue
+				left = points[k, 0] - d // 2
+				for i in range(d):
+					x = left + i
+					if x < 0 or x >= width or not mask[j, i]:
+						continue
+					for c in range(4):
+						if pixels[y, x, c] < color[c]:
+							pixels[y, x, c] = color[c]
+
+	@functools.lru_cache(maxsize=BRUSH_CACHE_SIZE)
+	def brush_mask(radius):
+		alpha = pygame.surfarray.array_alpha(get_brush(radius, (255, 255, 255, 255)))
+		return np.ascontiguousarray(alpha.T > 0)
+
+	def stamp_stroke_numba(surf, start, end, radius, color):
+		points = stroke_points(start, end, radius)
+		pixels = np.frombuffer(surf.get_buffer(), np.uint8).reshape(surf.get_height(), surf.get_pitch() // 4, 4)
+		packed = surf.map_rgb(color) & 0xFFFFFFFF
+		_stamp_kernel(pixels, np.array(points, dtype=np.int64), brush_mask(radius), np.frombuffer(packed.to_bytes(4, sys.byteorder), np.uint8))
+		# unlock the surface
+		del pixels
+		rects = [pygame.Rect(x - radius, y - radius, radius * 2, radius * 2) for x, y in points]
+		return rects[0].unionall(rects[1:]).clip(surf.get_rect())
+
+	return stamp_stroke_numba
+
+
 def save_combined(frame_surf, overlay_surf, path):
 	# Combine into a single surface and save as PNG
 	w, h = frame_surf.get_size()
@@ -78,8 +383,24 @@ def main():
 	parser.add_argument("--frames", default=ASSET_FRAMES_DIR, help="Frames directory")
 	parser.add_argument("--audio", default=ASSET_AUDIO_PATH, help="Path to audio file to play (optional)")
 	parser.add_argument("--no-audio", action="store_true", help="Do not load or play audio even if present")
+	parser.add_argument("--busy-loop", action="store_true", help="Pace frames with a busy-wait for tighter timing at the cost of a full CPU core")
+	parser.add_argument("--full-flip", action="store_true", help="Redraw and flip the whole window every frame instead of only changed areas")
+	parser.add_argument("--smooth", action="store_true", help="Use smooth (bilinear) scaling for frames that do not match the canvas size")
+	parser.add_argument("--hw", action="store_true", help="Use a hardware-accelerated (SCALED, double-buffered, vsynced) window")
+	parser.add_argument("--numba-brush", action="store_true", help="Paint large brushes with a numba kernel (needs numpy and numba)")
+	parser.add_argument("--pack", metavar="DIR", help=f"Pack the frames in DIR into {PACK_DATA}/{PACK_INDEX} for decode-free playback, then exit")
+	parser.add_argument("--no-grey", action="store_true", help="Keep greyscale videos as full-colour frames instead of 8-bit ones")
+	parser.add_argument("--cache-frames", type=int, default=DEFAULT_CACHE_FRAMES, help="Videos with up to this many frames are preloaded in full; longer ones are streamed")
 	args = parser.parse_args()
 
+	if args.pack:
+		count = pack_frames(args.pack, args.smooth)
+		if count:
+			print(f"Packed {count} frames into {os.path.join(args.pack, PACK_DATA)}")
+		else:
+			print(f"No frames to pack in {args.pack}")
+		return
+
 	# Ensure music/videos dirs exist for user to drop files
 	os.makedirs(os.path.join("assets", "music"), exist_ok=True)
 	os.makedirs(os.path.join("assets", "videos"), exist_ok=True)
@@ -90,15 +411,13 @@ def main():
 	# Helper: scan assets/music for available audio tracks and map to video folders
 	def scan_music_tracks():
 		music_dir = os.path.join("assets", "music")
-		exts = ["*.mp3", "*.ogg", "*.wav"]
 		tracks = []
-		for e in exts:
-			for p in glob.glob(os.path.join(music_dir, e)):
-				name = os.path.splitext(os.path.basename(p))[0]
-				# associated video frames dir is assets/videos/<name>/
-				video_dir = os.path.join("assets", "videos", name)
-				has_video = os.path.isdir(video_dir) and len(find_frame_files(video_dir)) > 0
-				tracks.append((p, name, has_video, video_dir))
+		for p in scan_dir(music_dir, AUDIO_EXTS):
+			name = os.path.splitext(os.path.basename(p))[0]
+			# associated video frames dir is assets/videos/<name>/
+			video_dir = os.path.join("assets", "videos", name)
+			has_video = os.path.isfile(os.path.join(video_dir, PACK_INDEX)) or len(find_frame_files(video_dir)) > 0
+			tracks.append((p, name, has_video, video_dir))
 		return sorted(tracks, key=lambda x: x[1].lower())
 
 	# If there are tracks in assets/music, show a simple selector before playback
@@ -151,10 +470,16 @@ def main():
 		# use associated video folder if it has frames, otherwise default frames dir
 		frames_dir = sel[3] if sel[2] else args.frames
 
-	frame_files = find_frame_files(frames_dir)
+	# A pack made with --pack replaces the image files
+	packed = load_packed_frames(frames_dir)
+	frame_files = [] if packed else find_frame_files(frames_dir)
 
 	# Determine window size from first frame or default
-	if frame_files:
+	if packed:
+		w, h = packed[1]
+		frame_surf = None
+		print(f"Using packed frames from {os.path.join(frames_dir, PACK_DATA)}")
+	elif frame_files:
 		first = load_frame_surface(frame_files[0])
 		if first is None:
 			print("Failed to load first frame; using 800x600 canvas")
@@ -167,14 +492,25 @@ def main():
 		w, h = 800, 600
 		frame_surf = None
 
+	frame_count = len(packed[0]) if packed else len(frame_files)
+
 	# Diagnostic prints to help when "nothing happens" — show what's found
-	print(f"Starting player — frames={len(frame_files)}  canvas={w}x{h}")
+	print(f"Starting player — frames={frame_count}  canvas={w}x{h}")
 	if len(frame_files) > 0:
 		print("Sample frames:", ", ".join(frame_files[:3]))
 
-	screen = pygame.display.set_mode((w, h))
+	screen = None
+	if args.hw:
+		# SDL_Renderer-backed window: presentation and vsync happen on the GPU
+		try:
+			screen = pygame.display.set_mode((w, h), pygame.SCALED | pygame.DOUBLEBUF, vsync=1)
+		except pygame.error as e:
+			print("Hardware display unavailable, using software window:", e)
+	if screen is None:
+		screen = pygame.display.set_mode((w, h))
 	pygame.display.set_caption("The World's Worst Video Player")
 	clock = pygame.time.Clock()
+	screen_rect = screen.get_rect()
 
 	fps = max(1, args.fps)
 
@@ -209,157 +545,188 @@ def main():
 
 	playing = False
 	frame_index = 0
-	last_time = time.time()
+	# Monotonic time can't jump with system clock changes
+	last_time = time.monotonic()
 	start_time = last_time
 
 	# Prepare font and static HUD text to avoid per-frame allocations
 	font = pygame.font.SysFont(None, 20)
 	instr = "Space=Play/Pause  [ ] / Arrows=Frame  c=clear  s=save  +/- brush"
 	instr_surf = font.render(instr, True, (200, 200, 200))
-
-	# reuse erase surface when brush changes
-	erase_surf = None
-
-	def current_frame_surface(idx):
-		if frame_files:
-			path = frame_files[idx]
-			surf = load_frame_surface(path)
-			if surf is None:
-				# Return an empty surface if load fails
-				return pygame.Surface((w, h))
-			# Scale first if needed
-			if surf.get_size() != (w, h):
-				surf = pygame.transform.smoothscale(surf, (w, h))
-			# Convert now that a display mode exists
-			if pygame.display.get_surface() is not None:
-				try:
-					surf = surf.convert_alpha() if surf.get_alpha() else surf.convert()
-				except Exception:
-					pass
-			return surf
+	# Translucent HUD backdrops are built once; the top one is canvas-wide and
+	# only the slice under the current text is blitted each frame
+	hud_box = pygame.Surface((w, font.get_linesize() + 8), pygame.SRCALPHA)
+	hud_box.fill((0, 0, 0, 160))
+	instr_box = pygame.Surface((instr_surf.get_width()+16, instr_surf.get_height()+8), pygame.SRCALPHA)
+	instr_box.fill((0, 0, 0, 160))
+	instr_rect = instr_box.get_rect(topleft=(4, h - 28))
+	# Only the dynamic top line is re-rendered, and only when its text changes;
+	# hud_dirty marks that its inputs may have changed
+	hud_dirty = True
+	last_info = None
+	txt = None
+	hud_rect = None
+
+	# Decode frames once after set_mode; a folder's frames share one pixel format
+	use_alpha = frame_surf is not None and frame_surf.get_alpha() is not None
+	if packed:
+		# Blitting converts the mapped pixels, so nothing is copied up front
+		frames = packed[0]
+	elif not frame_files:
+		# Blank background when no frames
+		blank = pygame.Surface((w, h))
+		blank.fill((30, 30, 30))
+		frames = [blank]
+	else:
+		# Greyscale videos (e.g. Bad Apple) are kept at one byte per pixel
+		grey = np is not None and not args.no_grey and not use_alpha and frames_look_greyscale(frame_files)
+		if grey:
+			print("Greyscale frames detected; storing them as 8-bit surfaces")
+		if len(frame_files) <= args.cache_frames:
+			print(f"Preloading {len(frame_files)} frames...")
+			frames = build_frame_cache(frame_files, (w, h), use_alpha, args.smooth, grey)
 		else:
-			# Blank background when no frames
-			s = pygame.Surface((w, h))
-			s.fill((30, 30, 30))
-			return s
+			frames = FrameStream(frame_files, (w, h), use_alpha, args.smooth, grey)
 
-	# Preload current frame once
-	cur_frame = current_frame_surface(frame_index)
-
-	# If we loaded an initial frame before set_mode, convert it now
-	if cur_frame is not None and pygame.display.get_surface() is not None:
-		try:
-			cur_frame = cur_frame.convert_alpha() if cur_frame.get_alpha() else cur_frame.convert()
-		except Exception:
-			# conversion isn't critical; continue with raw surface
-			pass
+	cur_frame = frames[frame_index]
 
 	drawing = False
 	erasing = False
+	stamp_stroke_numba = load_numba_brush() if args.numba_brush else None
+	if args.numba_brush and stamp_stroke_numba is None:
+		print("--numba-brush needs numpy and numba; using the sprite brush")
+	# last cursor position stamped in the current stroke
+	prev_mxy = None
 
 	# If audio is enabled, auto-start audio and playback by default
 	if audio_enabled:
 		try:
 			pygame.mixer.music.play(loops=-1)
 			audio_started = True
-			audio_start_time = time.time()
+			audio_start_time = time.monotonic()
 			playing = True
-			last_time = time.time()
+			last_time = audio_start_time
 		except Exception as e:
 			print("Failed to start audio automatically:", e)
 
 	# Ensure output dir exists
 	os.makedirs(OUTPUT_DIR, exist_ok=True)
 
+	# clock.tick() sleeps between frames; tick_busy_loop() spins
+	tick = clock.tick_busy_loop if args.busy_loop else clock.tick
+
+	# Only queue events the loop handles (TEXTINPUT fills KEYDOWN.unicode)
+	handled_events = [
+		pygame.QUIT, pygame.WINDOWEXPOSED, pygame.KEYDOWN, pygame.TEXTINPUT,
+		pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP,
+	]
+	pygame.event.set_blocked(None)
+	pygame.event.set_allowed(handled_events)
+
+	# Screen areas that need redrawing this frame; the first frame is full
+	dirty_rects = [screen_rect]
+	shown_frame = None
+
 	running = True
 	while running:
-		dt = clock.tick_busy_loop(fps) / 1000.0
-		for ev in pygame.event.get():
-			if ev.type == pygame.QUIT:
-				running = False
-			elif ev.type == pygame.KEYDOWN:
-				key = ev.key
-				uni = getattr(ev, 'unicode', '')
-				if key == pygame.K_ESCAPE:
+		dt = tick(fps) / 1000.0
+		t_now = time.monotonic()
+		# peek() needs the types: a bare peek() breaks event.post()ed events
+		if pygame.event.peek(handled_events):
+			for ev in pygame.event.get():
+				if ev.type == pygame.QUIT:
 					running = False
-				elif key == pygame.K_SPACE:
-					# Toggle play/pause and control audio if available
-					playing = not playing
-					if playing:
-						# resume or start audio
-						if audio_enabled:
+				elif ev.type == pygame.WINDOWEXPOSED:
+					dirty_rects.append(screen_rect)
+				elif ev.type == pygame.KEYDOWN:
+					# most keys change something the HUD shows
+					hud_dirty = True
+					key = ev.key
+					uni = getattr(ev, 'unicode', '')
+					if key == pygame.K_ESCAPE:
+						running = False
+					elif key == pygame.K_SPACE:
+						# Toggle play/pause and control audio if available
+						playing = not playing
+						if playing:
+							# resume or start audio
+							if audio_enabled:
+								try:
+									if not audio_started:
+										pygame.mixer.music.play(loops=-1)
+										audio_started = True
+										audio_start_time = t_now
+									else:
+										pygame.mixer.music.unpause()
+								except Exception as e:
+									print("Audio unpause failed:", e)
+							last_time = t_now
+						else:
+							# pause audio if playing
+							if audio_enabled and audio_started:
+								try:
+									pygame.mixer.music.pause()
+								except Exception:
+									pass
+					# Accept arrow keys or literal '[' and ']' typed (use ev.unicode)
+					elif (key == pygame.K_RIGHT) or (uni == ']'):
+						if not playing:
+							frame_index = (frame_index + 1) % max(1, frame_count)
+							cur_frame = frames[frame_index]
+					elif (key == pygame.K_LEFT) or (uni == '['):
+						if not playing:
+							frame_index = (frame_index - 1) % max(1, frame_count)
+							cur_frame = frames[frame_index]
+					elif ev.key == pygame.K_c:
+						overlay.fill((0, 0, 0, 0))
+						dirty_rects.append(screen_rect)
+					elif ev.key == pygame.K_s:
+						# Save current combined frame
+						name = f"frame_{frame_index:05d}_combined.png"
+						path = os.path.join(OUTPUT_DIR, name)
+						if save_combined(cur_frame, overlay, path):
+							print("Saved:", path)
+					elif ev.key == pygame.K_PLUS or ev.key == pygame.K_EQUALS:
+						brush_radius = min(200, brush_radius + 1)
+					elif ev.key == pygame.K_MINUS or ev.key == pygame.K_UNDERSCORE:
+						brush_radius = max(1, brush_radius - 1)
+					elif ev.key == pygame.K_COMMA:
+						# volume down
+						volume = max(0.0, volume - 0.1)
+						if audio_enabled and audio_started:
 							try:
-								if not audio_started:
-									pygame.mixer.music.play(loops=-1)
-									audio_started = True
-									audio_start_time = time.time()
-								else:
-									pygame.mixer.music.unpause()
-							except Exception as e:
-								print("Audio unpause failed:", e)
-						last_time = time.time()
-					else:
-						# pause audio if playing
+								pygame.mixer.music.set_volume(0.0 if muted else volume)
+							except Exception:
+								pass
+					elif ev.key == pygame.K_PERIOD:
+						# volume up
+						volume = min(1.0, volume + 0.1)
 						if audio_enabled and audio_started:
 							try:
-								pygame.mixer.music.pause()
+								pygame.mixer.music.set_volume(0.0 if muted else volume)
 							except Exception:
 								pass
-				# Accept arrow keys or literal '[' and ']' typed (use ev.unicode)
-				elif (key == pygame.K_RIGHT) or (uni == ']'):
-					if not playing:
-						frame_index = (frame_index + 1) % max(1, len(frame_files))
-						cur_frame = current_frame_surface(frame_index)
-				elif (key == pygame.K_LEFT) or (uni == '['):
-					if not playing:
-						frame_index = (frame_index - 1) % max(1, len(frame_files))
-						cur_frame = current_frame_surface(frame_index)
-				elif ev.key == pygame.K_c:
-					overlay.fill((0, 0, 0, 0))
-				elif ev.key == pygame.K_s:
-					# Save current combined frame
-					name = f"frame_{frame_index:05d}_combined.png"
-					path = os.path.join(OUTPUT_DIR, name)
-					if save_combined(cur_frame, overlay, path):
-						print("Saved:", path)
-				elif ev.key == pygame.K_PLUS or ev.key == pygame.K_EQUALS:
-					brush_radius = min(200, brush_radius + 1)
-				elif ev.key == pygame.K_MINUS or ev.key == pygame.K_UNDERSCORE:
-					brush_radius = max(1, brush_radius - 1)
-				elif ev.key == pygame.K_COMMA:
-					# volume down
-					volume = max(0.0, volume - 0.1)
-					if audio_enabled and audio_started:
-						try:
-							pygame.mixer.music.set_volume(0.0 if muted else volume)
-						except Exception:
-							pass
-				elif ev.key == pygame.K_PERIOD:
-					# volume up
-					volume = min(1.0, volume + 0.1)
-					if audio_enabled and audio_started:
-						try:
-							pygame.mixer.music.set_volume(0.0 if muted else volume)
-						except Exception:
-							pass
-				elif ev.key == pygame.K_m:
-					# mute toggle
-					muted = not muted
-					if audio_enabled and audio_started:
-						try:
-							pygame.mixer.music.set_volume(0.0 if muted else volume)
-						except Exception:
-							pass
-			elif ev.type == pygame.MOUSEBUTTONDOWN:
-				if ev.button == 1:
-					drawing = True
-				elif ev.button == 3:
-					erasing = True
-			elif ev.type == pygame.MOUSEBUTTONUP:
-				if ev.button == 1:
-					drawing = False
-				elif ev.button == 3:
-					erasing = False
+					elif ev.key == pygame.K_m:
+						# mute toggle
+						muted = not muted
+						if audio_enabled and audio_started:
+							try:
+								pygame.mixer.music.set_volume(0.0 if muted else volume)
+							except Exception:
+								pass
+				elif ev.type == pygame.MOUSEBUTTONDOWN:
+					# a click starts a new stroke; wheel scrolls (buttons 4/5) do not
+					if ev.button in (1, 3):
+						prev_mxy = None
+					if ev.button == 1:
+						drawing = True
+					elif ev.button == 3:
+						erasing = True
+				elif ev.type == pygame.MOUSEBUTTONUP:
+					if ev.button == 1:
+						drawing = False
+					elif ev.button == 3:
+						erasing = False
 
 		# Determine desired frame index
 		if audio_enabled and audio_started and playing:
@@ -370,56 +737,81 @@ def main():
 			else:
 				# fallback to wall-clock relative to audio start
 				if audio_start_time is not None:
-					elapsed = time.time() - audio_start_time - audio_pause_acc
+					elapsed = t_now - audio_start_time - audio_pause_acc
 				else:
-					elapsed = time.time() - start_time
-			if frame_files:
-				desired = int(elapsed * fps)
+					elapsed = t_now - start_time
+			if frame_count:
+				# Wrap before comparing so looping is not a frame change
+				desired = int(elapsed * fps) % frame_count
 				if desired != frame_index:
-					frame_index = desired % len(frame_files)
-					cur_frame = current_frame_surface(frame_index)
+					frame_index = desired
+					cur_frame = frames[frame_index]
+					hud_dirty = True
 		else:
 			# No audio master — use wall-clock stepping
-			if playing and frame_files:
-				now = time.time()
-				if now - last_time >= 1.0 / fps:
-					frame_index += 1
-					if frame_index >= len(frame_files):
-						frame_index = 0
-					cur_frame = current_frame_surface(frame_index)
-					last_time = now
+			if playing and frame_count:
+				# Skip every whole frame that elapsed; look up only the shown one
+				steps = int((t_now - last_time) * fps)
+				if steps:
+					frame_index = (frame_index + steps) % frame_count
+					cur_frame = frames[frame_index]
+					hud_dirty = True
+					last_time += steps / fps
 
 		# Handle drawing each frame
-		mx, my = pygame.mouse.get_pos()
-		if drawing and pygame.mouse.get_pressed()[0]:
-			pygame.draw.circle(overlay, brush_color, (mx, my), brush_radius)
-		if erasing and pygame.mouse.get_pressed()[2]:
-			# Erase by drawing transparent circle; reuse surface where possible
-			if erase_surf is None or erase_surf.get_width() != brush_radius * 2:
-				erase_surf = pygame.Surface((brush_radius * 2, brush_radius * 2), pygame.SRCALPHA)
-				erase_surf.fill((0, 0, 0, 0))
-				pygame.draw.circle(erase_surf, (0, 0, 0, 0), (brush_radius, brush_radius), brush_radius)
-			overlay.blit(erase_surf, (mx - brush_radius, my - brush_radius), special_flags=pygame.BLEND_RGBA_MIN)
+		if drawing or erasing:
+			mxy = pygame.mouse.get_pos()
+			# Stamp brush sprites along the cursor's path since the last frame
+			if mxy != prev_mxy:
+				if drawing:
+					if stamp_stroke_numba and brush_radius >= NUMBA_BRUSH_MIN_RADIUS:
+						dirty_rects.append(stamp_stroke_numba(overlay, prev_mxy, mxy, brush_radius, brush_color))
+					else:
+						brush = get_brush(brush_radius, brush_color)
+						dirty_rects.append(stamp_stroke(overlay, brush, prev_mxy, mxy, brush_radius, pygame.BLEND_RGBA_MAX))
+				if erasing:
+					eraser = get_brush(brush_radius, (0, 0, 0, 0), (255, 255, 255, 255))
+					dirty_rects.append(stamp_stroke(overlay, eraser, prev_mxy, mxy, brush_radius, pygame.BLEND_RGBA_MIN))
+				prev_mxy = mxy
 
 		# Render
-		screen.blit(cur_frame, (0, 0))
-		screen.blit(overlay, (0, 0))
-
 		# HUD with semi-transparent background for readability
-		info = f"Frame {frame_index+1}/{max(1,len(frame_files))}  FPS={fps}  Brush={brush_radius}  Vol={'M' if muted else f'{volume:.2f}'}  Playing={'Yes' if playing else 'No'}"
-		txt = font.render(info, True, (255, 255, 255))
-		# draw translucent boxes behind text
-		box = pygame.Surface((max(300, txt.get_width()+16), txt.get_height()+8), pygame.SRCALPHA)
-		box.fill((0, 0, 0, 160))
-		screen.blit(box, (4, 4))
-		screen.blit(txt, (8, 8))
-		# bottom instruction box
-		box2 = pygame.Surface((instr_surf.get_width()+16, instr_surf.get_height()+8), pygame.SRCALPHA)
-		box2.fill((0, 0, 0, 160))
-		screen.blit(box2, (4, h - 28))
-		screen.blit(instr_surf, (8, h - 24))
-
-		pygame.display.flip()
+		if hud_dirty:
+			info = f"Frame {frame_index+1}/{max(1,frame_count)}  FPS={fps}  Brush={brush_radius}  Vol={'M' if muted else f'{volume:.2f}'}  Playing={'Yes' if playing else 'No'}"
+			if info != last_info:
+				# the old box may be wider than the new one, so uncover it too
+				if hud_rect is not None:
+					dirty_rects.append(hud_rect)
+				txt = font.render(info, True, (255, 255, 255))
+				hud_rect = pygame.Rect(4, 4, max(300, txt.get_width()+16), txt.get_height()+8)
+				dirty_rects.append(hud_rect)
+				last_info = info
+			hud_dirty = False
+		if cur_frame is not shown_frame or args.full_flip:
+			dirty_rects = [screen_rect]
+			shown_frame = cur_frame
+
+		# Nothing changed (e.g. paused and idle): skip rendering entirely
+		if dirty_rects:
+			# A touched translucent HUD box is redrawn whole, or it darkens
+			hud_layers = []
+			if hud_rect.collidelist(dirty_rects) != -1:
+				dirty_rects.append(hud_rect)
+				hud_layers += [(hud_box, hud_rect, ((0, 0), hud_rect.size)), (txt, (8, 8))]
+			if instr_rect.collidelist(dirty_rects) != -1:
+				dirty_rects.append(instr_rect)
+				hud_layers += [(instr_box, instr_rect), (instr_surf, (8, h - 24))]
+			layers = []
+			for r in dirty_rects:
+				r = r.clip(screen_rect)
+				layers += [(cur_frame, r, r), (overlay, r, r)]
+			# One batched blit call
+			screen.blits(layers + hud_layers, doreturn=False)
+			if args.full_flip:
+				pygame.display.flip()
+			else:
+				pygame.display.update(dirty_rects)
+			dirty_rects = []
 
 if __name__ == "__main__":
 	main()